@@ -8,22 +8,295 @@ Free, no API keys required.
 Usage:
     python streamer.py --symbol BTCUSDT --timeframe 1m --exchange bybit
     python streamer.py --timeframe 1s --live
+    python streamer.py --symbol BTCUSDT,ETHUSDT --timeframe 1m,5m --live
 """
 
-import websocket
-import json
+import asyncio
+import csv
+import inspect
+import itertools
+import logging
+import queue
+import random
+import sys
+from operator import itemgetter
+from typing import NamedTuple
+import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 import argparse
-import threading
-import time
 import os
-from datetime import datetime
+import websockets
+from websockets.exceptions import ConnectionClosedOK, WebSocketException
+from websockets.protocol import State
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+try:
+    import httpx
+except ImportError:  # fetch_historical_many falls back to threads
+    httpx = None
+
+try:
+    import h2  # noqa: F401 -- httpx only speaks HTTP/2 when h2 is installed
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # Only needed for --format parquet/arrow
+    pa = None
+
+try:
+    import orjson as _json
+
+    loads = _json.loads
+
+    def dumps(obj):
+        return _json.dumps(obj).decode()
+except ImportError:  # Fall back to the (slower) stdlib parser
+    import json as _json
+
+    loads = _json.loads
+    dumps = _json.dumps
+
+logger = logging.getLogger('streamer')
+
+
+def _utc(ms):
+    """Epoch milliseconds -> UTC datetime"""
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+
+
+class Candle(NamedTuple):
+    """One live kline, as passed to on_candle callbacks"""
+    timestamp: int  # epoch milliseconds
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    confirmed: bool
+    symbol: str
+    timeframe: str
+
+
+CANDLE_DTYPE = np.dtype([
+    ('timestamp', 'i8'),  # epoch milliseconds
+    ('open', 'f8'),
+    ('high', 'f8'),
+    ('low', 'f8'),
+    ('close', 'f8'),
+    ('volume', 'f8'),
+])
+
+
+def _okx_inst_id(symbol):
+    """BTCUSDT -> BTC-USDT-SWAP"""
+    return f"{symbol[:3]}-{symbol[3:]}-SWAP"
+
+
+def _klines_to_array(klines):
+    """Convert REST kline rows ([ts, o, h, l, c, v, ...]) into a CANDLE_DTYPE array"""
+    out = np.empty(len(klines), dtype=CANDLE_DTYPE)
+    if not len(klines):
+        return out
+
+    raw = np.array(klines, dtype=str)
+    out['timestamp'] = raw[:, 0].astype(np.int64)
+    for i, name in enumerate(CANDLE_DTYPE.names[1:], start=1):
+        out[name] = raw[:, i].astype(np.float64)
+    return out
+
+
+def _sort_by_time(candles):
+    """Order candles oldest-first; newest-first responses are just reversed"""
+    ts = candles['timestamp']
+    if len(ts) < 2 or (ts[1:] > ts[:-1]).all():
+        return candles
+    if (ts[1:] < ts[:-1]).all():
+        return candles[::-1].copy()
+
+    candles.sort(order='timestamp')
+    return candles
+
+
+def _to_arrow(candles):
+    """CANDLE_DTYPE array -> pyarrow Table, column by column (no pandas)"""
+    columns = [pa.array(candles['timestamp'], type=pa.timestamp('ms', tz='UTC'))]
+    columns += [pa.array(candles[name]) for name in CANDLE_DTYPE.names[1:]]
+    return pa.Table.from_arrays(columns, names=list(CANDLE_DTYPE.names))
+
+
+class CandleBuffer:
+    """
+    Fixed-capacity candle window over a preallocated structured array.
+
+    The backing array holds twice the capacity. When the write head hits the
+    end, the newest `capacity` rows are moved back to the front in one block
+    copy, so appends are amortized O(1) and `view()` is always a contiguous,
+    time-ordered slice (no copy).
+    """
+
+    def __init__(self, capacity=10000):
+        self.capacity = capacity
+        self._buf = np.empty(2 * capacity, dtype=CANDLE_DTYPE)
+        self._end = len(self._buf)
+        self._head = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def _compact(self, keep):
+        """Move the newest `keep` rows to the front of the backing array"""
+        if keep:
+            self._buf[:keep] = self._buf[self._head - keep:self._head]
+        self._head = keep
+
+    def append(self, timestamp, open_, high, low, close, volume):
+        """Write one candle at the head (hot path: one record store, no calls)"""
+        head = self._head
+        if head == self._end:
+            self._compact(self.capacity)
+            head = self._head
+        self._buf[head] = (timestamp, open_, high, low, close, volume)
+        self._head = head + 1
+        if self._count < self.capacity:
+            self._count += 1
+
+    def extend(self, candles):
+        """Bulk-append a CANDLE_DTYPE array"""
+        candles = candles[-self.capacity:]
+        n = len(candles)
+        if self._head + n > len(self._buf):
+            self._compact(min(self.capacity - n, self._count))
+        self._buf[self._head:self._head + n] = candles
+        self._head += n
+        self._count = min(self._count + n, self.capacity)
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+
+    def view(self):
+        """Time-ordered view of the buffered candles"""
+        return self._buf[self._head - self._count:self._head]
+
+
+class _WSPool:
+    """
+    One active plus one pre-connected standby WebSocket for an exchange.
+
+    The standby has already finished the TCP/TLS/WebSocket handshake but is
+    not subscribed, so it carries no data until promoted. While idle it is
+    kept alive with the exchange's app-level ping and redialed in the
+    background if the exchange closes it anyway. When the active connection
+    drops, the standby takes over and only needs its subscribe frame; a new
+    standby is dialed in the background.
+    """
+
+    def __init__(self, url, ping=None, ping_interval=20, **connect_kwargs):
+        self.url = url
+        self.ping = ping
+        self.ping_interval = ping_interval
+        self.connect_kwargs = connect_kwargs
+        self._standby = None
+        self._keeper = None
+
+    async def _connect(self):
+        return await websockets.connect(self.url, **self.connect_kwargs)
+
+    def _warm(self):
+        """Dial a new standby and start keeping it alive"""
+        self._standby = standby = asyncio.create_task(self._connect())
+        self._keeper = asyncio.create_task(self._keep_alive(standby))
+
+    async def _keep_alive(self, standby):
+        """Ping the idle standby, drain its replies, and redial it once it closes"""
+        try:
+            # Shielded: cancelling the keeper must not cancel a handshake in flight
+            ws = await asyncio.shield(standby)
+        except (WebSocketException, OSError):
+            return  # ready() stays False; the next acquire() dials fresh
+
+        loop = asyncio.get_running_loop()
+        opened = loop.time()
+        next_ping = opened + self.ping_interval
+
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(ws.recv(decode=False), max(next_ping - loop.time(), 0))
+                except asyncio.TimeoutError:
+                    if self.ping is not None:
+                        await ws.send(self.ping)
+                    next_ping = loop.time() + self.ping_interval
+        except (WebSocketException, OSError):
+            pass
+
+        # Closed while idle: redial, but no more than once per ping interval
+        await asyncio.sleep(max(opened + self.ping_interval - loop.time(), 0))
+        if self._standby is standby:
+            self._warm()
+
+    def ready(self):
+        """True if a standby connection is open and waiting"""
+        standby = self._standby
+        if standby is None or not standby.done() or standby.cancelled():
+            return False
+        return standby.exception() is None and standby.result().state is State.OPEN
+
+    async def _take_standby(self):
+        """Detach the standby from its keeper so the caller can read from it"""
+        standby, keeper = self._standby, self._keeper
+        self._standby = self._keeper = None
+        if keeper is not None:
+            keeper.cancel()
+            await asyncio.gather(keeper, return_exceptions=True)
+        return standby
+
+    async def acquire(self):
+        """Promote the standby (or dial fresh) and start warming the next one"""
+        standby = await self._take_standby()
+        ws = None
+
+        if standby is not None and not standby.cancelled():
+            try:
+                ws = await standby
+            except (WebSocketException, OSError):
+                ws = None
+            if ws is not None and ws.state is not State.OPEN:
+                ws = None
+
+        if ws is None:
+            ws = await self._connect()
+
+        self._warm()
+        return ws
+
+    async def close(self):
+        """Drop the standby connection"""
+        standby = await self._take_standby()
+        if standby is None:
+            return
+        if not standby.done():
+            standby.cancel()
+        elif not standby.cancelled() and standby.exception() is None:
+            await standby.result().close()
+
 
 class MultiExchangeStreamer:
     """
     Stream live candles from multiple exchanges simultaneously.
     Supports: Bybit, Binance, OKX (all free, no API keys)
+
+    Every (symbol, timeframe) pair is multiplexed over a single WebSocket
+    per exchange and kept in its own CandleBuffer.
     """
 
     EXCHANGES = {
@@ -33,7 +306,7 @@ class MultiExchangeStreamer:
             'intervals': {'1s': '1', '1m': '1', '5m': '5', '15m': '15', '1h': '60', '4h': '240', '1D': 'D'}
         },
         'binance': {
-            'ws': 'wss://fstream.binance.com/ws',
+            'ws': 'wss://fstream.binance.com/stream',
             'rest': 'https://fapi.binance.com/fapi/v1/klines',
             'intervals': {'1s': '1s', '1m': '1m', '5m': '5m', '15m': '15m', '1h': '1h', '4h': '4h', '1D': '1d'}
         },
@@ -44,334 +317,504 @@ class MultiExchangeStreamer:
         }
     }
 
-    def __init__(self, symbol='BTCUSDT', timeframe='1m', exchange='bybit', output_dir='data'):
-        self.symbol = symbol
-        self.timeframe = timeframe
+    OUTPUT_FORMATS = ('csv', 'parquet', 'arrow')
+
+    # Reconnect backoff: base * 2**attempt seconds, capped, with +/-50% jitter
+    RECONNECT_BASE = 1.0
+    RECONNECT_CAP = 60.0
+
+    def __init__(self, symbols='BTCUSDT', timeframes='1m', exchange='bybit', output_dir='data',
+                 output_format='csv'):
+        if output_format not in self.OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+        if output_format != 'csv' and pa is None:
+            raise ImportError(f"{output_format} output requires pyarrow (pip install pyarrow)")
+
+        self.symbols = [symbols] if isinstance(symbols, str) else list(symbols)
+        self.timeframes = [timeframes] if isinstance(timeframes, str) else list(timeframes)
         self.exchange = exchange
         self.output_dir = output_dir
-        self.candles = []
+        self.output_format = output_format
+        self.streams = list(itertools.product(self.symbols, self.timeframes))
+        self.buffers = {stream: CandleBuffer(10000) for stream in self.streams}
         self.ws = None
         self.running = False
         self.on_candle_callback = None
+        self.latest_pending = {}
+        self._csv_files = {}
+        self._csv_writers = {}
+
+        # One keep-alive session so repeated REST fetches reuse the TCP/TLS connection
+        self.http = self._session()
 
         os.makedirs(output_dir, exist_ok=True)
 
+    def candles(self, symbol, timeframe):
+        """Buffered candles for one stream as a CANDLE_DTYPE array view"""
+        return self.buffers[(symbol, timeframe)].view()
+
     def fetch_historical(self, limit=1000):
-        """Fetch historical candles via REST API"""
-        print(f"📥 Fetching {limit} historical {self.timeframe} candles from {self.exchange}...")
+        """Fetch historical candles via REST API for every stream"""
+        results = {}
 
-        try:
-            if self.exchange == 'bybit':
-                data = self._fetch_bybit_historical(limit)
-            elif self.exchange == 'binance':
-                data = self._fetch_binance_historical(limit)
-            elif self.exchange == 'okx':
-                data = self._fetch_okx_historical(limit)
-            else:
-                raise ValueError(f"Unknown exchange: {self.exchange}")
-
-            self.candles = data
-            self._save_csv('historical')
-            print(f"✅ Loaded {len(data)} historical candles")
-            return data
-
-        except Exception as e:
-            print(f"❌ Historical fetch error: {e}")
-            return []
-
-    def _fetch_bybit_historical(self, limit):
-        """Fetch from Bybit API"""
-        url = self.EXCHANGES['bybit']['rest']
-        interval = self.EXCHANGES['bybit']['intervals'].get(self.timeframe, '1')
-
-        params = {
-            'category': 'linear',
-            'symbol': self.symbol,
-            'interval': interval,
-            'limit': min(limit, 1000)
-        }
+        for symbol, timeframe in self.streams:
+            logger.info("📥 Fetching %d historical %s %s candles from %s...", limit, timeframe, symbol, self.exchange)
+
+            try:
+                data = self._fetch_sync(self.http, self.exchange, symbol, timeframe, limit)
+                self.load_historical((symbol, timeframe), data)
 
-        resp = requests.get(url, params=params, timeout=10)
+            except Exception as e:
+                logger.error("❌ Historical fetch error: %s", e)
+                data = np.empty(0, dtype=CANDLE_DTYPE)
+
+            results[(symbol, timeframe)] = data
+
+        return results
+
+    @classmethod
+    async def fetch_historical_many(cls, specs, limit=1000):
+        """
+        Fetch historical candles for many (exchange, symbol, timeframe) specs concurrently.
+
+        Uses one shared httpx client (HTTP/2 when h2 is installed) so all requests
+        overlap; without httpx a keep-alive session is driven from worker threads.
+        Returns {spec: CANDLE_DTYPE array}; failed specs map to an empty array.
+        """
+        specs = [tuple(spec) for spec in specs]
+        logger.info("📥 Fetching %d historical candles for %d streams...", limit, len(specs))
+
+        if httpx is not None:
+            limits = httpx.Limits(max_connections=20)
+            async with httpx.AsyncClient(http2=_HTTP2, limits=limits, timeout=10) as client:
+                results = await asyncio.gather(
+                    *(cls._fetch_async(client, *spec, limit) for spec in specs),
+                    return_exceptions=True
+                )
+        else:
+            with cls._session() as session:
+                results = await asyncio.gather(
+                    *(asyncio.to_thread(cls._fetch_sync, session, *spec, limit) for spec in specs),
+                    return_exceptions=True
+                )
+
+        out = {}
+        for spec, result in zip(specs, results):
+            if isinstance(result, Exception):
+                logger.error("❌ Historical fetch error %s: %s", spec, result)
+                result = np.empty(0, dtype=CANDLE_DTYPE)
+            out[spec] = result
+        return out
+
+    def load_historical(self, stream, data):
+        """Replace a stream's buffer with fetched history and snapshot it"""
+        buffer = self.buffers[stream]
+        buffer.clear()
+        buffer.extend(data)
+        self._save('historical', stream)
+        logger.info("✅ Loaded %d historical %s %s candles", len(data), stream[1], stream[0])
+
+    @staticmethod
+    def _session():
+        """requests.Session with a keep-alive connection pool"""
+        session = requests.Session()
+        session.headers.update({'Accept-Encoding': 'gzip'})
+        session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        return session
+
+    @classmethod
+    def _fetch_sync(cls, session, exchange, symbol, timeframe, limit):
+        """Blocking fetch over a keep-alive session"""
+        url, params = cls._kline_request(exchange, symbol, timeframe, limit)
+        resp = session.get(url, params=params, timeout=10)
         resp.raise_for_status()
-        data = resp.json()
-
-        if 'result' not in data or 'list' not in data['result']:
-            raise ValueError(f"Invalid Bybit response: {data}")
-
-        candles = []
-        for kline in data['result']['list']:
-            candles.append({
-                'timestamp': pd.to_datetime(int(kline[0]), unit='ms'),
-                'open': float(kline[1]),
-                'high': float(kline[2]),
-                'low': float(kline[3]),
-                'close': float(kline[4]),
-                'volume': float(kline[5])
-            })
-
-        return sorted(candles, key=lambda x: x['timestamp'])
-
-    def _fetch_binance_historical(self, limit):
-        """Fetch from Binance Futures API"""
-        url = self.EXCHANGES['binance']['rest']
-        interval = self.EXCHANGES['binance']['intervals'].get(self.timeframe, '1m')
-
-        params = {
-            'symbol': self.symbol,
-            'interval': interval,
-            'limit': min(limit, 1500)
-        }
+        return cls._parse_klines(exchange, resp.json())
 
-        resp = requests.get(url, params=params, timeout=10)
+    @classmethod
+    async def _fetch_async(cls, client, exchange, symbol, timeframe, limit):
+        """Non-blocking fetch over a shared httpx.AsyncClient"""
+        url, params = cls._kline_request(exchange, symbol, timeframe, limit)
+        resp = await client.get(url, params=params)
         resp.raise_for_status()
-        data = resp.json()
-
-        candles = []
-        for kline in data:
-            candles.append({
-                'timestamp': pd.to_datetime(int(kline[0]), unit='ms'),
-                'open': float(kline[1]),
-                'high': float(kline[2]),
-                'low': float(kline[3]),
-                'close': float(kline[4]),
-                'volume': float(kline[5])
-            })
+        return cls._parse_klines(exchange, loads(resp.content))
+
+    @classmethod
+    def _kline_request(cls, exchange, symbol, timeframe, limit):
+        """REST URL and query params for a kline request"""
+        if exchange not in cls.EXCHANGES:
+            raise ValueError(f"Unknown exchange: {exchange}")
+
+        config = cls.EXCHANGES[exchange]
+
+        if exchange == 'bybit':
+            params = {
+                'category': 'linear',
+                'symbol': symbol,
+                'interval': config['intervals'].get(timeframe, '1'),
+                'limit': min(limit, 1000)
+            }
+        elif exchange == 'binance':
+            params = {
+                'symbol': symbol,
+                'interval': config['intervals'].get(timeframe, '1m'),
+                'limit': min(limit, 1500)
+            }
+        else:
+            params = {
+                'instId': _okx_inst_id(symbol),
+                'bar': config['intervals'].get(timeframe, '1m'),
+                'limit': min(limit, 300)
+            }
+
+        return config['rest'], params
+
+    @staticmethod
+    def _parse_klines(exchange, data):
+        """Turn a decoded REST response into a time-ordered CANDLE_DTYPE array"""
+        if exchange == 'bybit':
+            if 'result' not in data or 'list' not in data['result']:
+                raise ValueError(f"Invalid Bybit response: {data}")
+            candles = _sort_by_time(_klines_to_array(data['result']['list']))
+        elif exchange == 'binance':
+            candles = _klines_to_array(data)
+        else:
+            if 'data' not in data:
+                raise ValueError(f"Invalid OKX response: {data}")
+            candles = _sort_by_time(_klines_to_array(data['data']))
 
         return candles
 
-    def _fetch_okx_historical(self, limit):
-        """Fetch from OKX API"""
-        url = self.EXCHANGES['okx']['rest']
-        interval = self.EXCHANGES['okx']['intervals'].get(self.timeframe, '1m')
-        inst_id = f"{self.symbol[:3]}-{self.symbol[3:]}-SWAP"
+    async def start_live(self, on_candle=None):
+        """
+        Start live WebSocket streaming.
 
-        params = {
-            'instId': inst_id,
-            'bar': interval,
-            'limit': min(limit, 300)
-        }
-
-        resp = requests.get(url, params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-
-        if 'data' not in data:
-            raise ValueError(f"Invalid OKX response: {data}")
-
-        candles = []
-        for kline in data['data']:
-            candles.append({
-                'timestamp': pd.to_datetime(int(kline[0]), unit='ms'),
-                'open': float(kline[1]),
-                'high': float(kline[2]),
-                'low': float(kline[3]),
-                'close': float(kline[4]),
-                'volume': float(kline[5])
-            })
-
-        return sorted(candles, key=lambda x: x['timestamp'])
-
-    def start_live(self, on_candle=None):
-        """Start live WebSocket streaming"""
+        `on_candle` (sync or async) is called with a Candle once per closed
+        bar; the bar still forming is kept in `latest_pending[(symbol, timeframe)]`.
+        """
         self.running = True
         self.on_candle_callback = on_candle
+        self._open_live_csv()
 
         if self.exchange == 'bybit':
-            self._start_bybit_ws()
+            await self._start_bybit_ws()
         elif self.exchange == 'binance':
-            self._start_binance_ws()
+            await self._start_binance_ws()
         elif self.exchange == 'okx':
-            self._start_okx_ws()
+            await self._start_okx_ws()
 
-    def _start_bybit_ws(self):
-        """Bybit WebSocket (supports 1s)"""
-        interval = self.EXCHANGES['bybit']['intervals'].get(self.timeframe, '1')
+    async def _run_ws(self, name, url, on_message, subscribe, ping=None):
+        """Subscribe and pump messages until stopped, failing over to a warm standby on drops"""
+        pool = _WSPool(url, ping=ping, compression=None, max_size=2**20)
+        attempt = 0
 
-        def on_message(ws, message):
-            try:
-                data = json.loads(message)
-                if 'data' in data and f'kline.{interval}' in data.get('topic', ''):
-                    candle_data = data['data'][0]
-                    candle = {
-                        'timestamp': pd.to_datetime(int(candle_data['start']), unit='ms'),
-                        'open': float(candle_data['open']),
-                        'high': float(candle_data['high']),
-                        'low': float(candle_data['low']),
-                        'close': float(candle_data['close']),
-                        'volume': float(candle_data['volume']),
-                        'confirmed': candle_data.get('confirm', False)
-                    }
-                    self._process_candle(candle)
-            except Exception as e:
-                print(f"❌ WS message error: {e}")
-
-        def on_open(ws):
-            print(f"🚀 Connected to Bybit {self.timeframe} {self.symbol}")
-            subscribe = {
-                "op": "subscribe",
-                "args": [f"kline.{interval}.{self.symbol}"]
-            }
-            ws.send(json.dumps(subscribe))
-
-        def on_error(ws, error):
-            print(f"❌ WS Error: {error}")
-
-        def on_close(ws, close_status_code, close_msg):
-            print("🔌 WebSocket closed")
-            if self.running:
-                print("🔄 Reconnecting in 5s...")
-                time.sleep(5)
-                self._start_bybit_ws()
-
-        self.ws = websocket.WebSocketApp(
-            self.EXCHANGES['bybit']['ws'],
-            on_open=on_open,
-            on_message=on_message,
-            on_error=on_error,
-            on_close=on_close
+        try:
+            while self.running:
+                delivered = False
+                try:
+                    ws = await pool.acquire()
+                    async with ws:
+                        self.ws = ws
+                        await ws.send(dumps(subscribe))
+                        logger.info("🚀 Connected to %s %s %s", name, ','.join(self.timeframes), ','.join(self.symbols))
+
+                        while True:
+                            # Raw frame bytes: no UTF-8 decode, the JSON parser takes bytes
+                            message = await ws.recv(decode=False)
+
+                            # Subscribe acks and pongs have no "data" key; drop them unparsed
+                            if b'"data"' not in message:
+                                continue
+                            delivered = True
+
+                            try:
+                                await on_message(message)
+                            except Exception as e:
+                                logger.error("❌ WS message error: %s", e)
+
+                except ConnectionClosedOK:
+                    pass
+                except (WebSocketException, OSError) as e:
+                    logger.error("❌ WS Error: %s", e)
+
+                self.ws = None
+                logger.info("🔌 WebSocket closed")
+                if self.running:
+                    # Instant failover only after a connection that actually streamed;
+                    # one that drops before any data backs off even with a standby ready
+                    if delivered:
+                        attempt = 0
+                    if delivered and pool.ready():
+                        logger.info("🔄 Switching to standby connection...")
+                    else:
+                        delay = self._backoff_delay(attempt)
+                        attempt += 1
+                        logger.info("🔄 Reconnecting in %.1fs...", delay)
+                        await asyncio.sleep(delay)
+        finally:
+            await pool.close()
+
+    def _backoff_delay(self, attempt):
+        """Exponential backoff with jitter so many streamers don't reconnect in lockstep"""
+        delay = min(self.RECONNECT_CAP, self.RECONNECT_BASE * 2 ** attempt)
+        return delay * random.uniform(0.5, 1.5)
+
+    def _dispatch_table(self, feed_key):
+        """
+        Map each stream's exchange-side feed key (topic/channel) to the stream.
+
+        Timeframes the exchange can't tell apart (e.g. Bybit serves 1s and 1m
+        from the same '1' interval) would share a key; later duplicates are
+        skipped with a warning instead of silently replacing the first.
+        """
+        table = {}
+        for symbol, timeframe in self.streams:
+            key = feed_key(symbol, timeframe)
+            if key in table:
+                logger.warning(
+                    "⚠️ %s %s %s is the same feed as %s %s; not streaming it",
+                    self.exchange, symbol, timeframe, *table[key]
+                )
+                continue
+            table[key] = (symbol, timeframe)
+        return table
+
+    async def _start_bybit_ws(self):
+        """Bybit WebSocket (supports 1s), one topic per stream"""
+        intervals = self.EXCHANGES['bybit']['intervals']
+        topics = self._dispatch_table(
+            lambda symbol, timeframe: f"kline.{intervals.get(timeframe, '1')}.{symbol}"
         )
-        self.ws.run_forever()
-
-    def _start_binance_ws(self):
-        """Binance Futures WebSocket"""
-        interval = self.EXCHANGES['binance']['intervals'].get(self.timeframe, '1m')
-        symbol_lower = self.symbol.lower()
-        ws_url = f"{self.EXCHANGES['binance']['ws']}/{symbol_lower}@kline_{interval}"
-
-        def on_message(ws, message):
-            try:
-                data = json.loads(message)
-                if 'k' in data:
-                    kline = data['k']
-                    candle = {
-                        'timestamp': pd.to_datetime(int(kline['t']), unit='ms'),
-                        'open': float(kline['o']),
-                        'high': float(kline['h']),
-                        'low': float(kline['l']),
-                        'close': float(kline['c']),
-                        'volume': float(kline['v']),
-                        'confirmed': kline['x']
-                    }
-                    self._process_candle(candle)
-            except Exception as e:
-                print(f"❌ WS message error: {e}")
-
-        def on_open(ws):
-            print(f"🚀 Connected to Binance {self.timeframe} {self.symbol}")
-
-        self.ws = websocket.WebSocketApp(
-            ws_url,
-            on_open=on_open,
-            on_message=on_message
+        fields = itemgetter('start', 'open', 'high', 'low', 'close', 'volume', 'confirm')
+
+        async def on_message(message):
+            data = loads(message)
+            stream = topics.get(data.get('topic'))
+            if stream is None or 'data' not in data:
+                return
+            symbol, timeframe = stream
+            for t, o, h, l, c, v, x in map(fields, data['data']):
+                await self._process_candle(Candle(
+                    int(t), float(o), float(h), float(l), float(c), float(v), x, symbol, timeframe
+                ))
+
+        subscribe = {
+            "op": "subscribe",
+            "args": list(topics)
+        }
+        await self._run_ws('Bybit', self.EXCHANGES['bybit']['ws'], on_message, subscribe,
+                           ping=dumps({"op": "ping"}))
+
+    async def _start_binance_ws(self):
+        """Binance Futures WebSocket, all streams on one combined-stream connection"""
+        intervals = self.EXCHANGES['binance']['intervals']
+        streams = self._dispatch_table(
+            lambda symbol, timeframe: f"{symbol.lower()}@kline_{intervals.get(timeframe, '1m')}"
         )
-        self.ws.run_forever()
-
-    def _start_okx_ws(self):
-        """OKX WebSocket"""
-        interval = self.EXCHANGES['okx']['intervals'].get(self.timeframe, '1m')
-        inst_id = f"{self.symbol[:3]}-{self.symbol[3:]}-SWAP"
-
-        def on_message(ws, message):
-            try:
-                data = json.loads(message)
-                if 'data' in data:
-                    for kline in data['data']:
-                        candle = {
-                            'timestamp': pd.to_datetime(int(kline[0]), unit='ms'),
-                            'open': float(kline[1]),
-                            'high': float(kline[2]),
-                            'low': float(kline[3]),
-                            'close': float(kline[4]),
-                            'volume': float(kline[5]),
-                            'confirmed': True
-                        }
-                        self._process_candle(candle)
-            except Exception as e:
-                print(f"❌ WS message error: {e}")
-
-        def on_open(ws):
-            print(f"🚀 Connected to OKX {self.timeframe} {self.symbol}")
-            subscribe = {
-                "op": "subscribe",
-                "args": [{"channel": f"candle{interval}", "instId": inst_id}]
-            }
-            ws.send(json.dumps(subscribe))
+        fields = itemgetter('t', 'o', 'h', 'l', 'c', 'v', 'x')
+
+        async def on_message(message):
+            data = loads(message)
+            stream = streams.get(data.get('stream'))
+            if stream is None or 'k' not in data['data']:
+                return
+            symbol, timeframe = stream
+            t, o, h, l, c, v, x = fields(data['data']['k'])
+            await self._process_candle(Candle(
+                int(t), float(o), float(h), float(l), float(c), float(v), x, symbol, timeframe
+            ))
+
+        subscribe = {
+            "method": "SUBSCRIBE",
+            "params": list(streams),
+            "id": 1
+        }
+        await self._run_ws('Binance', self.EXCHANGES['binance']['ws'], on_message, subscribe)
 
-        self.ws = websocket.WebSocketApp(
-            self.EXCHANGES['okx']['ws'],
-            on_open=on_open,
-            on_message=on_message
+    async def _start_okx_ws(self):
+        """OKX WebSocket, one candle channel per stream"""
+        intervals = self.EXCHANGES['okx']['intervals']
+        channels = self._dispatch_table(
+            lambda symbol, timeframe: (f"candle{intervals.get(timeframe, '1m')}", _okx_inst_id(symbol))
         )
-        self.ws.run_forever()
+        fields = itemgetter(0, 1, 2, 3, 4, 5, 8)
+
+        async def on_message(message):
+            data = loads(message)
+            if 'data' not in data:
+                return
+            arg = data.get('arg', {})
+            stream = channels.get((arg.get('channel'), arg.get('instId')))
+            if stream is None:
+                return
+            symbol, timeframe = stream
+            for t, o, h, l, c, v, x in map(fields, data['data']):
+                await self._process_candle(Candle(
+                    int(t), float(o), float(h), float(l), float(c), float(v), x == '1', symbol, timeframe
+                ))
+
+        subscribe = {
+            "op": "subscribe",
+            "args": [{"channel": channel, "instId": inst_id} for channel, inst_id in channels]
+        }
+        await self._run_ws('OKX', self.EXCHANGES['okx']['ws'], on_message, subscribe, ping='ping')
 
-    def _process_candle(self, candle):
+    async def _process_candle(self, candle):
         """Process incoming candle"""
-        self.candles.append(candle)
+        stream = (candle.symbol, candle.timeframe)
+
+        # Mid-bar ticks only refresh the pending candle; the bar is stored once it closes
+        if not candle.confirmed:
+            self.latest_pending[stream] = candle
+            return
 
-        # Keep last 10000 candles in memory
-        if len(self.candles) > 10000:
-            self.candles = self.candles[-10000:]
+        # A frame may carry a newer forming bar ahead of this closed one; keep it
+        pending = self.latest_pending.get(stream)
+        if pending is not None and pending.timestamp <= candle.timestamp:
+            del self.latest_pending[stream]
+        self._append(stream, candle)
 
-        # Print candle
-        print(f"🕐 {candle['timestamp']} | O:{candle['open']:.4f} H:{candle['high']:.4f} L:{candle['low']:.4f} C:{candle['close']:.4f} V:{candle['volume']:.2f}")
+        # Log candle (skipped entirely unless DEBUG is enabled)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "🕐 %s %s %s | O:%.4f H:%.4f L:%.4f C:%.4f V:%.2f",
+                stream[0], stream[1], _utc(candle.timestamp), candle.open,
+                candle.high, candle.low, candle.close, candle.volume
+            )
 
         # Call user callback
         if self.on_candle_callback:
-            self.on_candle_callback(candle)
-
-        # Auto-save every 100 candles
-        if len(self.candles) % 100 == 0:
-            self._save_csv('live')
-
-    def _save_csv(self, prefix=''):
-        """Save candles to CSV"""
-        if not self.candles:
-            return
-
-        df = pd.DataFrame(self.candles)
-        filename = f"{self.output_dir}/{self.symbol}_{self.timeframe}_{prefix}.csv"
-        df.to_csv(filename, index=False)
-        print(f"💾 Saved {len(df)} candles to {filename}")
+            result = self.on_candle_callback(candle)
+            if inspect.isawaitable(result):
+                await result
+
+        # Append to the live CSV
+        writer = self._csv_writers.get(stream)
+        if writer is not None:
+            writer.writerow((_utc(candle.timestamp), *candle[1:6]))
+
+    def _append(self, stream, candle):
+        """Write a Candle into the stream's ring buffer"""
+        self.buffers[stream].append(*candle[:6])
+
+    def _path(self, stream, prefix, ext='csv'):
+        symbol, timeframe = stream
+        return f"{self.output_dir}/{self.exchange}_{symbol}_{timeframe}_{prefix}.{ext}"
+
+    def _open_live_csv(self):
+        """Open each stream's live CSV once in append mode, writing the header if new"""
+        for stream in self.streams:
+            if stream in self._csv_writers:
+                continue
+
+            filename = self._path(stream, 'live')
+            is_new = not os.path.exists(filename) or os.path.getsize(filename) == 0
+            fp = open(filename, 'a', newline='', buffering=1)
+            self._csv_writers[stream] = writer = csv.writer(fp)
+            self._csv_files[stream] = fp
+            if is_new:
+                writer.writerow(CANDLE_DTYPE.names)
+
+    def _save(self, prefix='', stream=None):
+        """Dump candles in `output_format` (one file per stream, or just `stream`)"""
+        for stream in [stream] if stream is not None else self.streams:
+            candles = self.buffers[stream].view()
+            if not len(candles):
+                continue
+
+            filename = self._path(stream, prefix, self.output_format)
+            if self.output_format == 'csv':
+                df = pd.DataFrame(candles)
+                df['timestamp'] = pd.to_datetime(df['timestamp'].values, unit='ms', utc=True)
+                df.to_csv(filename, index=False)
+            elif self.output_format == 'parquet':
+                pq.write_table(_to_arrow(candles), filename, compression='zstd')
+            else:
+                feather.write_feather(_to_arrow(candles), filename)
+            logger.info("💾 Saved %d candles to %s", len(candles), filename)
 
     def stop(self):
         """Stop streaming"""
         self.running = False
-        if self.ws:
-            self.ws.close()
-        self._save_csv('final')
+        if self.ws is not None:
+            try:
+                asyncio.get_running_loop().create_task(self.ws.close())
+            except RuntimeError:
+                pass  # Event loop already gone (e.g. after Ctrl+C)
+            self.ws = None
+        for fp in self._csv_files.values():
+            fp.close()
+        self._csv_files.clear()
+        self._csv_writers.clear()
+        self.http.close()
+        self._save('final')
 
 
 def main():
     parser = argparse.ArgumentParser(description='Multi-Exchange Candle Streamer')
-    parser.add_argument('--symbol', '-s', default='BTCUSDT', help='Trading symbol')
-    parser.add_argument('--timeframe', '-t', default='1m', help='Timeframe (1s, 1m, 5m, 15m, 1h, 4h, 1D)')
-    parser.add_argument('--exchange', '-e', default='bybit', help='Exchange (bybit, binance, okx)')
+    parser.add_argument('--symbol', '-s', default='BTCUSDT', help='Trading symbol(s), comma-separated')
+    parser.add_argument('--timeframe', '-t', default='1m', help='Timeframe(s), comma-separated (1s, 1m, 5m, 15m, 1h, 4h, 1D)')
+    parser.add_argument('--exchange', '-e', default='bybit', help='Exchange(s), comma-separated (bybit, binance, okx)')
     parser.add_argument('--bars', '-n', type=int, default=500, help='Historical bars to fetch')
     parser.add_argument('--live', '-l', action='store_true', help='Enable live streaming')
     parser.add_argument('--output', '-o', default='data', help='Output directory')
+    parser.add_argument('--format', '-f', default='csv', choices=MultiExchangeStreamer.OUTPUT_FORMATS,
+                        help='Snapshot file format (live candles are always appended to CSV)')
+    parser.add_argument('--quiet', '-q', action='store_true', help='Do not log every candle')
 
     args = parser.parse_args()
+    listener = _setup_logging(args.quiet)
+
+    logger.info("🌙 Moon AI tvpine-cli Streamer v1.0.0\n")
+
+    try:
+        streamers = [
+            MultiExchangeStreamer(
+                symbols=[symbol.strip() for symbol in args.symbol.split(',')],
+                timeframes=[timeframe.strip() for timeframe in args.timeframe.split(',')],
+                exchange=exchange.strip(),
+                output_dir=args.output,
+                output_format=args.format
+            )
+            for exchange in args.exchange.split(',')
+        ]
+
+        # Fetch historical data (one concurrent batch across all exchanges)
+        specs = [(s.exchange, *stream) for s in streamers for stream in s.streams]
+        history = asyncio.run(MultiExchangeStreamer.fetch_historical_many(specs, args.bars))
+        for streamer in streamers:
+            for stream in streamer.streams:
+                streamer.load_historical(stream, history[(streamer.exchange, *stream)])
+
+        # Start live streaming if requested (all exchanges share one event loop)
+        if args.live:
+            logger.info("\n🔴 Starting live %s stream (Ctrl+C to stop)...\n", args.timeframe)
+            try:
+                asyncio.run(_run_all(streamers))
+            except KeyboardInterrupt:
+                logger.info("\n⏹️ Stopping...")
+                for streamer in streamers:
+                    streamer.stop()
+    finally:
+        listener.stop()
 
-    print("🌙 Moon AI tvpine-cli Streamer v1.0.0\n")
 
-    streamer = MultiExchangeStreamer(
-        symbol=args.symbol,
-        timeframe=args.timeframe,
-        exchange=args.exchange,
-        output_dir=args.output
-    )
+def _setup_logging(quiet):
+    """Log through a queue so the event loop never blocks on a slow stdout"""
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
 
-    # Fetch historical data
-    streamer.fetch_historical(args.bars)
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(logging.INFO if quiet else logging.DEBUG)
+    logger.propagate = False
 
-    # Start live streaming if requested
-    if args.live:
-        print(f"\n🔴 Starting live {args.timeframe} stream (Ctrl+C to stop)...\n")
-        try:
-            streamer.start_live()
-        except KeyboardInterrupt:
-            print("\n⏹️ Stopping...")
-            streamer.stop()
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    return listener
+
+
+async def _run_all(streamers):
+    await asyncio.gather(*(streamer.start_live() for streamer in streamers))
 
 
 if __name__ == "__main__":